@@ -1,18 +1,46 @@
 """使用 ``CSES`` 类可以表示、解析一个 CSES 课程文件。"""
 import datetime
+import functools
+import mmap
 import os
+import stat
+from typing import IO
 
 import yaml
 
 import cses.structures as st
 import cses.errors as err
-from cses.utils import log, repr_
+from cses.utils import log, repr_, LazyRepr, enable_debug_logging
 from cses import utils
 
-yaml.add_representer(datetime.time, utils.serialize_time)
+__all__ = ['CSES', 'enable_debug_logging']
+
+yaml.add_representer(datetime.time, utils.serialize_time)  # 使导入本库后 yaml.dump() 也能序列化 datetime.time
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)  # 优先使用 libyaml 提供的 C 解析器
 log.info("cseslib4py initialized!")
 
 
+@functools.lru_cache(maxsize=32)
+def _load_file(path: str, mtime_ns: int, size: int) -> dict:
+    """
+    读取并解析路径 ``path`` 处的 CSES 课程文件，返回解析得到的字典。
+
+    结果以 ``(path, mtime_ns, size)`` 为键缓存，文件被修改后缓存会自动失效。
+    缓存的只是 YAML 解析结果，每次调用 ``CSES.from_file()`` 仍会构造新的对象，因此修改返回的课表不会影响缓存。
+
+    Args:
+        path (str): CSES 课程文件的真实路径
+        mtime_ns (int): 文件的修改时间（纳秒），仅用作缓存键
+        size (int): 文件的大小，用作缓存键，并用于跳过无法映射的空文件
+    """
+    with open(path, 'rb') as f:
+        if size == 0:  # mmap 无法映射空文件，直接交由 YAML 解析（得到 None，随后由 _from_dict 报错）
+            return yaml.load(f, Loader=_Loader)
+        # 将文件映射进内存后交由 libyaml 直接读取字节并解码，省去整文件的读入拷贝
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return yaml.load(mm, Loader=_Loader)
+
+
 class CSES:
     """
     用来表示、解析一个 CSES 课程文件的类。
@@ -33,7 +61,6 @@ class CSES:
          '物理': Subject(name='物理', simplified_name='物', teacher='赵军', room='104')}
 
     """
-
     def __init__(self):
         """
         初始化一个空CSES课表。
@@ -53,52 +80,59 @@ class CSES:
             content (str): CSES 课程文件的内容。
         """
 
-        data = yaml.safe_load(content)
+        log.info("Loading CSES schedules %s", LazyRepr(content))
+        return cls._from_dict(yaml.load(content, Loader=_Loader))
+
+    @classmethod
+    def from_stream(cls, stream: IO) -> 'CSES':
+        """
+        从已打开的流 ``stream`` 中读取并新建一个 CSES 课表对象。
+
+        Args:
+            stream (IO): CSES 课程文件的文本或二进制流。
+        """
+        return cls._from_dict(yaml.load(stream, Loader=_Loader))
+
+    @classmethod
+    def _from_dict(cls, data: dict) -> 'CSES':
+        """
+        从 YAML 解析得到的字典 ``data`` 中构造 CSES 课表对象。
+
+        Args:
+            data (dict): CSES 课程文件解析后的字典。
+        """
+        # 先检查顶层字段，使非 CSES 文件在构造任何对象之前就失败
+        if not isinstance(data, dict):
+            raise err.ParseError(f'CSES 课程文件的顶层应为映射: {repr_(data)}')
+        if missing := {'version', 'subjects', 'schedules'} - data.keys():
+            raise err.ParseError(f'CSES 课程文件缺少字段: {sorted(missing)}')
+
         new_schedule = cls()
-        log.info(f"Loading CSES schedules {repr_(content)}")
 
         # 版本处理&检查
-        log.debug(f"Checking version: {data['version']}")
+        log.debug("Checking version: %s", data['version'])
         new_schedule.version = data['version']
         if new_schedule.version != 1:
             raise err.VersionError(f'不支持的版本号: {new_schedule.version}')
 
         # 科目处理&检查
         try:
-            log.debug(f"Processing subjects: {repr_(data['subjects'])}")
-            new_schedule.subjects = {s['name']: st.Subject(**s) for s in data['subjects']}
+            log.debug("Processing subjects: %s", LazyRepr(data['subjects']))
+            new_schedule.subjects = {s.name: s for s in st.SubjectList.validate_python(data['subjects'])}
         except st.ValidationError as e:
             raise err.ParseError(f'科目数据有误: {data['subjects']}') from e
 
         # 课程处理&检查
         schedules = data['schedules']
-        log.debug(f"Processing schedules: {repr_(schedules)}")
+        log.debug("Processing schedules: %s", LazyRepr(schedules))
         try:
-            # 先构造课程列表，再构造课表
-            schedule_classes = {i['name']: i['classes'] for i in schedules}
-            built_lessons = {i['name']: [] for i in schedules}
-            for name, classes in schedule_classes.items():
-                for lesson in classes:
-                    built_lessons[name].append(
-                        st.Lesson(**lesson)
-                    )
-            log.debug(f"Built lessons: {repr_(built_lessons)}")
-
-            # 从构造好的课程列表中构造课表
-            new_schedule.schedules = st.Schedule([
-                st.SingleDaySchedule(
-                    enable_day=day['enable_day'],
-                    classes=built_lessons[day['name']],
-                    name=day['name'],
-                    weeks=day['weeks'],
-                )
-                for day in schedules
-            ])
-            log.debug(f"Built schedules: {repr_(new_schedule.schedules)}")
+            # 一次遍历构造全部单日课表（连同其中的课程），无需中间的课程字典
+            new_schedule.schedules = st.Schedule(st.SingleDayScheduleList.validate_python(schedules))
+            log.debug("Built schedules: %d days", len(new_schedule.schedules))
         except st.ValidationError as e:
             raise err.ParseError(f'课程数据有误: {data['schedules']}') from e
 
-        log.info(f"Created Schedule: {repr_(new_schedule)}")
+        log.info("Created Schedule: %s", LazyRepr(new_schedule))
         return new_schedule
 
     @classmethod
@@ -108,24 +142,47 @@ class CSES:
 
         Args:
             fp (str): CSES 课程文件的路径。
-        """
-        with open(fp, encoding='utf8') as f:
-            return CSES.from_str(f.read())
 
-    def to_yaml(self) -> str:
+        Examples:
+            >>> import tempfile
+            >>> with tempfile.NamedTemporaryFile(suffix='.yaml', delete=False) as f:
+            ...     pass
+            >>> CSES.from_file(f.name)  # 空文件与 ``CSES.from_str('')`` 一样抛出 ParseError
+            Traceback (most recent call last):
+                ...
+            cses.errors.ParseError: CSES 课程文件的顶层应为映射: None
+            >>> os.remove(f.name)
+        """
+        path = os.path.realpath(fp)
+        info = os.stat(path)
+        if not stat.S_ISREG(info.st_mode):  # FIFO 等非普通文件的内容与修改时间无关，既不能映射也不能缓存
+            with open(path, 'rb') as f:
+                return cls.from_stream(f)
+        return cls._from_dict(_load_file(path, info.st_mtime_ns, info.st_size))
+
+    def to_yaml(self, fast: bool = False) -> str:
         """
         将当前 CSES 课表对象转换为 YAML 字符串。
 
+        Args:
+            fast (bool, optional): 是否使用基于 libyaml 的 ``utils.SafeDumper`` 输出，默认为 ``False`` 。
+                其速度更快，但列表项不会额外缩进（内容相同，仅格式不同）。
+
         Returns:
             str: 当前 CSES 课表对象的 YAML 字符串表示。
+
+        Examples:
+            >>> c = CSES.from_file('../cses_example.yaml')
+            >>> CSES.from_str(c.to_yaml(fast=True)) == c
+            True
         """
         res = yaml.dump(self._gen_dict(),
                         default_flow_style=False,
                         sort_keys=False,
                         allow_unicode=True,
                         indent=2,
-                        Dumper=utils.CustomizeDumper)
-        log.debug(f"Generated YAML: {repr_(res)}")
+                        Dumper=utils.SafeDumper if fast else utils.CustomizeDumper)
+        log.debug("Generated YAML: %s", LazyRepr(res))
         return res
 
     def to_file(self, fp: str, mode: str = 'w'):
@@ -139,7 +196,7 @@ class CSES:
         os.makedirs(os.path.dirname(fp), exist_ok=True)
         with open(fp, mode, encoding='utf8') as f:
             f.write(self.to_yaml())
-        log.info(f"Written CSES schedule file to {repr_(fp)}.")
+        log.info("Written CSES schedule file to %s.", LazyRepr(fp))
 
     def _gen_dict(self) -> dict:
         """
@@ -150,8 +207,8 @@ class CSES:
         """
         return {
             'version': self.version,
-            'subjects': [subject.model_dump() for subject in self.subjects.values()],
-            'schedules': [schedule.model_dump() for schedule in self.schedules.data],
+            'subjects': st.SubjectList.dump_python(list(self.subjects.values())),
+            'schedules': st.SingleDayScheduleList.dump_python(self.schedules.data),
         }
 
     def __eq__(self, other):
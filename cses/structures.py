@@ -5,11 +5,16 @@
 .. caution:: 该模块中的数据结构仅用于表示课程结构（与其附属工具），不包含实际的读取/写入功能。
 """
 import datetime
+import itertools
+import sys
+from array import array
+from bisect import bisect_right
 from collections import UserList
 from collections.abc import Sequence
 from typing import override, Optional, Literal, Annotated
 
-from pydantic import BaseModel, ValidationError, BeforeValidator, field_serializer
+from pydantic import BaseModel, ConfigDict, PrivateAttr, ValidationError, AfterValidator, BeforeValidator, \
+    TypeAdapter, field_serializer
 
 import cses.utils as utils
 
@@ -34,8 +39,12 @@ class Subject(BaseModel):
         '张三'
         >>> s.room
         'A101'
+
+    .. note:: ``Subject`` 对象是不可变的，因此可以被哈希，相同的科目可以被共享与去重。
     """
-    name: str
+    model_config = ConfigDict(frozen=True)
+
+    name: Annotated[str, AfterValidator(sys.intern)]  # 科目名会在课程中反复出现，驻留以节省内存并加快比较
     simplified_name: Optional[str] = None
     teacher: Optional[str] = None
     room: Optional[str] = None
@@ -61,14 +70,46 @@ class Lesson(BaseModel):
         datetime.time(8, 0)
         >>> l.end_time
         datetime.time(8, 45)
+
+    .. note:: ``Lesson`` 对象是不可变的，因此可以被哈希，相同的课程可以被共享与去重。
     """
-    subject: str
+    model_config = ConfigDict(frozen=True)
+
+    subject: Annotated[str, AfterValidator(sys.intern)]
     start_time: Annotated[datetime.time, BeforeValidator(utils.ensure_time)]
     end_time: Annotated[datetime.time, BeforeValidator(utils.ensure_time)]
 
     @field_serializer("start_time", "end_time")
     def serialize_time(self, time: datetime.time) -> str:
-        return time.strftime("%H:%M:%S")
+        return f"{time.hour:02d}:{time.minute:02d}:{time.second:02d}"
+
+
+#: 各周次类型对应的周次奇偶性： ``-1`` 表示适用于所有周，``1`` 表示单周，``0`` 表示双周。
+WEEKS_PARITY = {'all': -1, 'odd': 1, 'even': 0}
+
+#: 批量校验科目列表的 ``TypeAdapter`` ，一次调用即可校验整个列表，而无需逐个构造 ``Subject`` 。
+SubjectList = TypeAdapter(list[Subject])
+
+
+class _TimeIndex:
+    """
+    ``SingleDaySchedule.lookup`` 使用的时间索引：按开始时间排序的并列数组（以一天中的秒数表示）。
+    它只是由 ``classes`` 派生的缓存，因此不参与 ``SingleDaySchedule`` 的相等比较。
+    """
+    __slots__ = ('source', 'starts', 'ends', 'max_ends', 'order')
+
+    def __init__(self, classes: list[Lesson]):
+        order = sorted(range(len(classes)), key=lambda i: classes[i].start_time)
+        self.source = classes  # 构造索引所用的课程列表，用于判断索引是否过期
+        self.order = array('H', order)
+        self.starts = array('i', [utils.seconds_of_day(classes[i].start_time) for i in order])
+        self.ends = array('i', [utils.seconds_of_day(classes[i].end_time) for i in order])
+        self.max_ends = array('i', itertools.accumulate(self.ends, max))  # ends 的前缀最大值，用于处理重叠的课程
+
+    def __eq__(self, other):
+        return True if other is None or isinstance(other, _TimeIndex) else NotImplemented
+
+    __hash__ = None
 
 
 class SingleDaySchedule(BaseModel):
@@ -96,6 +137,54 @@ class SingleDaySchedule(BaseModel):
     name: str
     weeks: Literal['all', 'odd', 'even']
 
+    _time_index: Optional[_TimeIndex] = PrivateAttr(default=None)  # 供 ``lookup`` 使用，首次查找时才构造
+
+    def lookup(self, t: datetime.time) -> Optional[Lesson]:
+        """
+        查找在时间 ``t`` 正在进行的课程。
+
+        Args:
+            t (datetime.time): 要查找的时间
+
+        Returns:
+            Optional[Lesson]: 在该时间正在进行的课程（包含开始时间，不包含结束时间）；若没有，则返回 ``None`` 。
+            若有多节课程同时在进行（课程时间重叠），则返回其中开始时间最晚的一节
+
+        .. caution::
+            查找所用的时间索引在首次查找时生成，并在 ``classes`` 被整体替换（如重新赋值或 ``model_copy(update=...)`` ）后重建；
+            但原地修改 ``classes`` 列表（如 ``append`` ）不会反映在查找结果中。
+
+        Examples:
+            >>> s = SingleDaySchedule(enable_day=1, classes=[Lesson(subject='语文', start_time=datetime.time(8, 0, 0), \
+                                      end_time=datetime.time(8, 45, 0))], name='星期一', weeks='all')
+            >>> s.lookup(datetime.time(8, 30)).subject
+            '语文'
+            >>> s.lookup(datetime.time(8, 45)) is None
+            True
+            >>> s = SingleDaySchedule(enable_day=1, classes=[
+            ...     Lesson(subject='语文', start_time=datetime.time(7, 0, 0), end_time=datetime.time(12, 0, 0)),
+            ...     Lesson(subject='数学', start_time=datetime.time(8, 0, 0), end_time=datetime.time(8, 45, 0))
+            ... ], name='星期一', weeks='all')
+            >>> s.lookup(datetime.time(8, 30)).subject
+            '数学'
+            >>> s.lookup(datetime.time(10, 0)).subject
+            '语文'
+            >>> s.classes = []  # 整体替换课程列表后索引会重建
+            >>> s.lookup(datetime.time(10, 0)) is None
+            True
+        """
+        if (index := self._time_index) is None or index.source is not self.classes:
+            self._time_index = index = _TimeIndex(self.classes)
+        t_sec = utils.seconds_of_day(t)
+        i = bisect_right(index.starts, t_sec) - 1
+        # 从开始时间不晚于 t 的最后一节课向前查找；一旦此前所有课程都已在 t 之前结束即可停止，
+        # 因此课程互不重叠时只需检查一节课
+        while i >= 0 and t_sec < index.max_ends[i]:
+            if t_sec < index.ends[i]:
+                return self.classes[index.order[i]]
+            i -= 1
+        return None
+
     def is_enabled_on_week(self, week: int) -> bool:
         """
         判断课程是否在指定的日期上启用。
@@ -116,11 +205,8 @@ class SingleDaySchedule(BaseModel):
             >>> s.is_enabled_on_week(11)
             True
         """
-        return {
-            'all': True,  # 适用于所有周 -> 永久启用
-            'odd': week % 2 == 1,  # 单周
-            'even': week % 2 == 0  # 双周
-        }[self.weeks]
+        parity = WEEKS_PARITY[self.weeks]
+        return parity < 0 or (week & 1) == parity
 
     def is_enabled_on_day(self, start_day: datetime.date, day: datetime.date) -> bool:
         """
@@ -143,7 +229,11 @@ class SingleDaySchedule(BaseModel):
             >>> s.is_enabled_on_day(datetime.date(2025, 9, 1), datetime.date(2025, 9, 24))
             False
         """
-        return self.is_enabled_on_week(utils.week_num(start_day, day))
+        return self.weeks == 'all' or self.is_enabled_on_week(utils.week_num(start_day, day))  # 全周课表无需计算周次
+
+
+#: 批量校验/导出单日课程安排列表的 ``TypeAdapter`` 。
+SingleDayScheduleList = TypeAdapter(list[SingleDaySchedule])
 
 
 class Schedule(UserList[SingleDaySchedule]):
@@ -171,7 +261,8 @@ class Schedule(UserList[SingleDaySchedule]):
 
     @override
     def __getitem__(self, index: int) -> SingleDaySchedule:
-        if index < 1 or index > 7:
-            utils.log.warning(f'Illegal index {utils.repr_(index)} calling {self.__class__.__qualname__}.__getitem__')
+        if not 1 <= index <= 7:
+            utils.log.warning('Illegal index %s calling %s.__getitem__',
+                              utils.LazyRepr(index), self.__class__.__qualname__)
             raise IndexError(f'Index {index} out of range [1, 7]')
         return self.data[index - 1]
@@ -2,19 +2,52 @@
 该模块包含了一些用于内部处理的辅助函数。您也可以在您的代码中独立调用这些函数。
 """
 import datetime
-import re
+import functools
 import logging
 import reprlib
-from sys import stderr
+from typing import Any, Callable
 
 import yaml
 
-logging.basicConfig(level=logging.DEBUG,
-                    format="[{asctime} - {module}.{funcName}:{lineno}] \t{levelname}:\t {message}",
-                    style="{",
-                    stream=stderr)
 log = logging.getLogger(__name__)
-log.info(f"Loaded logger: {log!r}")
+log.addHandler(logging.NullHandler())  # 作为库不配置日志输出，交由应用程序决定
+_debug_handler: logging.Handler | None = None  # enable_debug_logging() 添加的处理器
+
+
+def enable_debug_logging(stream=None) -> logging.Handler:
+    """
+    为 ``cseslib4py`` 的日志器添加一个输出全部调试信息的处理器，并将日志器的级别设为 ``DEBUG`` ，便于排查问题。
+    重复调用不会重复添加。
+
+    .. caution::
+        移除返回的处理器不会恢复日志器的级别。若要完全撤销，请在 ``log.removeHandler(handler)`` 之后
+        调用 ``log.setLevel(logging.NOTSET)`` （或恢复为原先的级别）。
+
+    Args:
+        stream (optional): 日志输出的流，默认为 ``sys.stderr``
+
+    Returns:
+        logging.Handler: 添加（或已存在）的处理器
+
+    Examples:
+        >>> handler = enable_debug_logging()
+        >>> enable_debug_logging() is handler  # 重复调用返回同一个处理器
+        True
+        >>> log.level == logging.DEBUG
+        True
+        >>> log.removeHandler(handler)
+        >>> log.setLevel(logging.NOTSET)
+    """
+    global _debug_handler
+    if _debug_handler is not None and _debug_handler in log.handlers:
+        return _debug_handler
+    _debug_handler = logging.StreamHandler(stream)
+    _debug_handler.setFormatter(logging.Formatter(
+        "[{asctime} - {module}.{funcName}:{lineno}] \t{levelname}:\t {message}", style="{"))
+    log.addHandler(_debug_handler)
+    log.setLevel(logging.DEBUG)
+    return _debug_handler
+
 
 repr_ = reprlib.Repr(
     maxlevel=3, maxtuple=3, maxlist=3, maxarray=3, maxdict=3, maxset=3, maxfrozenset=3, maxdeque=3,
@@ -22,6 +55,60 @@ repr_ = reprlib.Repr(
 ).repr
 
 
+class LazyRepr:
+    """
+    延迟调用 ``repr_`` 的包装，用作日志参数：只有当日志记录真正被格式化时才会计算其表示。
+
+    Examples:
+        >>> log.debug("Loading %s", LazyRepr(list(range(10))))  # 若 DEBUG 级别被过滤，则不会调用 repr_
+        >>> str(LazyRepr(list(range(10))))
+        '[0, 1, 2,  ... ]'
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return repr_(self.value)
+
+
+# numpy 与 numba 均为可选依赖，且导入耗时较长（合计数百毫秒），因此只在批量计算的函数首次被调用时才导入
+def _require_numpy(func_name: str):
+    try:
+        import numpy
+    except ImportError:
+        log.error("%s requires numpy, which is not installed", func_name)
+        raise ImportError(f"{func_name} 需要安装 numpy (pip install pycses[fast])") from None
+    return numpy
+
+
+@functools.cache
+def _numba_kernels():
+    """首次调用时导入 numba 并定义 JIT 编译的内核；未安装 numba 时返回 ``None`` 。"""
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(parallel=True, cache=True)
+    def batch_enabled_kernel(start_ordinal, day_ordinals, parities, out):
+        for i in numba.prange(day_ordinals.size):
+            bit = ((day_ordinals[i] - start_ordinal) // 7 + 1) & 1
+            for j in range(parities.size):
+                out[i, j] = parities[j] < 0 or bit == parities[j]
+
+    @numba.njit(parallel=True, cache=True)
+    def secs_to_hms_kernel(secs, h_out, m_out, s_out):
+        for i in numba.prange(secs.size):
+            n = secs[i]
+            h_out[i] = n // 3600
+            m_out[i] = (n // 60) % 60
+            s_out[i] = n % 60
+
+    return batch_enabled_kernel, secs_to_hms_kernel
+
+
 def week_num(start_day: datetime.date, day: datetime.date) -> int:
     """
     计算指定日期是从开始日期开始的第多少周。
@@ -41,8 +128,113 @@ def week_num(start_day: datetime.date, day: datetime.date) -> int:
         >>> week_num(datetime.date(2025, 9, 1), datetime.date(2025, 10, 24))
         8
     """
-    res = (day - start_day).days // 7 + 1
-    return res
+    return week_num_from_ordinal(start_day.toordinal(), day)
+
+
+def week_num_from_ordinal(start_ordinal: int, day: datetime.date) -> int:
+    """
+    与 ``week_num`` 相同，但开始日期以 ``datetime.date.toordinal()`` 的结果给出。
+    在对同一开始日期反复计算周次时，可以事先计算好 ``start_ordinal`` 以减少重复工作。
+
+    Args:
+        start_ordinal (int): 课程开始日期的序数，即 ``start_day.toordinal()``
+        day (datetime.date): 要计算周次的日期
+
+    Returns:
+        int: 指定日期是从开始日期开始的第多少周
+
+    Examples:
+        >>> start = datetime.date(2025, 9, 1).toordinal()
+        >>> week_num_from_ordinal(start, datetime.date(2025, 9, 4))
+        1
+        >>> week_num_from_ordinal(start, datetime.date(2025, 9, 16))
+        3
+    """
+    return (day.toordinal() - start_ordinal) // 7 + 1  # 整数相减，无需构造 timedelta 对象
+
+
+def week_nums(start_day: datetime.date, days):
+    """
+    ``week_num`` 的向量化版本，一次计算多个日期各自是从开始日期开始的第多少周。需要安装 ``numpy`` 。
+
+    Args:
+        start_day (datetime.date): 课程开始的日期，用于计算周次
+        days (numpy.ndarray): 要计算周次的日期组成的 ``datetime64[D]`` 数组（或可以转换为该类型的序列）
+
+    Returns:
+        numpy.ndarray: 各日期对应的周次组成的整数数组
+
+    Examples:
+        >>> import numpy as np
+        >>> week_nums(datetime.date(2025, 9, 1), np.array(['2025-09-04', '2025-09-16', '2025-10-24'], 'datetime64[D]'))
+        array([1, 3, 8])
+    """
+    np = _require_numpy('week_nums')
+    days = np.asarray(days, dtype='datetime64[D]')
+    return (days - np.datetime64(start_day, 'D')).astype(np.int64) // 7 + 1
+
+
+def batch_enabled(start_ordinal: int, day_ordinals, parities):
+    """
+    批量判断多个单日课程安排在多个日期上是否启用。安装了 ``numba`` 时使用 JIT 编译的内核，否则使用 ``numpy`` 向量化计算。
+
+    Args:
+        start_ordinal (int): 课程开始日期的序数，即 ``start_day.toordinal()``
+        day_ordinals (numpy.ndarray): 要检查的日期序数组成的一维整数数组
+        parities (numpy.ndarray): 各课程安排的周次奇偶性组成的一维整数数组，取值参见 ``structures.WEEKS_PARITY``
+
+    Returns:
+        numpy.ndarray: 形状为 ``(len(day_ordinals), len(parities))`` 的布尔数组，
+        第 ``i`` 行第 ``j`` 列表示第 ``j`` 个课程安排是否在第 ``i`` 个日期上启用
+
+    Examples:
+        >>> start = datetime.date(2025, 9, 1).toordinal()
+        >>> import numpy as np
+        >>> days = np.array([start + 3, start + 15, start + 23])
+        >>> batch_enabled(start, days, np.array([-1, 1, 0])).tolist()
+        [[True, True, False], [True, True, False], [True, False, True]]
+    """
+    np = _require_numpy('batch_enabled')
+    day_ordinals = np.asarray(day_ordinals, dtype=np.int64)
+    parities = np.asarray(parities, dtype=np.int8)
+    if (kernels := _numba_kernels()) is not None:
+        out = np.empty((day_ordinals.size, parities.size), dtype=np.bool_)
+        kernels[0](start_ordinal, day_ordinals, parities, out)
+        return out
+    bits = (((day_ordinals - start_ordinal) // 7 + 1) & 1)[:, np.newaxis]
+    return (parities < 0) | (bits == parities)
+
+
+# 课表中的上下课时间往往只有少数几种，且 datetime.time 不可变，因此缓存转换结果并共享同一对象是安全的
+@functools.lru_cache(maxsize=256)
+def _time_from_str(any_time: str) -> datetime.time:
+    # fromisoformat 还接受 HH:MM 、带小数秒等格式，因此先限定为 HH:MM:SS 的形状，数字与范围交由其（C 实现）检查
+    if not (len(any_time) == 8 and any_time[2] == ':' and any_time[5] == ':'):
+        raise ValueError(f"Invalid time format for CSES format: {any_time!r}")
+    try:
+        return datetime.time.fromisoformat(any_time)
+    except ValueError as e:
+        raise ValueError(f"Invalid time format for CSES format: {any_time!r}") from e
+
+
+@functools.lru_cache(maxsize=256)
+def _time_from_int(any_time: int) -> datetime.time:
+    return datetime.time(any_time // 3600, (any_time // 60) % 60, any_time % 60)
+
+
+# 按输入的确切类型分派转换函数：一次字典查找代替逐个 isinstance 判断（因此 bool 等 int 的子类不会被当作秒数）
+_TIME_CONVERTERS = {
+    datetime.time: lambda t: t,  # 已经是datetime.time对象（如 YAML 已解析出时间），直接返回
+    str: _time_from_str,  # 解析 HH:MM:SS 格式（CSES Schema 指定的时间格式）的字符串
+    int: _time_from_int,  # 将秒数转换为时间对象
+}
+
+
+def _time_converter(any_time: Any) -> Callable[[Any], datetime.time]:
+    if (convert := _TIME_CONVERTERS.get(type(any_time))) is None:
+        log.error("Unknown time type: %s, raising an error...", type(any_time).__name__)
+        raise ValueError(f"Invalid time value for CSES format: {any_time!r}") from None
+    return convert
 
 
 def ensure_time(any_time: str | int | datetime.time) -> datetime.time:
@@ -61,25 +253,76 @@ def ensure_time(any_time: str | int | datetime.time) -> datetime.time:
         >>> ensure_time(10*3600 + 10*60 +10)  # =36610
         datetime.time(10, 10, 10)
     """
-    pattern_for_str = re.compile(r"([01]\d|2[0-3]):([0-5]\d):([0-5]\d)")  # CSES Schema 指定的时间格式
+    return _time_converter(any_time)(any_time)
 
-    if isinstance(any_time, str):  # 使用regex处理字符串格式的时间
-        if not (matched := pattern_for_str.match(any_time)):
-            raise ValueError(f"Invalid time format for CSES format: {any_time!r}")
-        else:
-            res =  datetime.time(*map(int, matched.groups()))
 
-    elif isinstance(any_time, int):  # 将秒数转换为时间对象
-        res = datetime.time(any_time // 3600, (any_time // 60) % 60, any_time % 60)
+def make_time_parser(sample: str | int | datetime.time) -> Callable[[Any], datetime.time]:
+    """
+    根据样本值的类型返回专用的时间转换函数。批量转换类型相同的时间值时，可以先取得转换函数再逐个调用，
+    从而省去 ``ensure_time`` 每次调用时的类型分派。
+
+    .. caution:: 返回的函数不会再检查输入的类型，所有输入都应与 ``sample`` 的类型相同。
+
+    Args:
+        sample (str | int | datetime.time): 样本时间值，格式要求与 ``ensure_time`` 相同
+
+    Returns:
+        Callable: 将与 ``sample`` 同类型的时间值转换为 ``datetime.time`` 对象的函数
+
+    Examples:
+        >>> parse = make_time_parser("08:00:00")
+        >>> [parse(t) for t in ["08:00:00", "08:45:00"]]
+        [datetime.time(8, 0), datetime.time(8, 45)]
+    """
+    return _time_converter(sample)
 
-    elif isinstance(any_time, datetime.time):  # 已经是datetime.time对象，直接返回
-        res = any_time
 
-    else:
-        log.error(f"Unknown time type: {type(any_time)}, raising an error...")
-        raise ValueError(f"Invalid time value for CSES format: {any_time}")
+def secs_to_hms(secs) -> tuple:
+    """
+    将一组表示一天中经过秒数的整数批量转换为时、分、秒三个 ``uint8`` 数组，即 ``ensure_time`` 整数分支的批量版本。
+    安装了 ``numba`` 时使用 JIT 编译的内核，否则使用 ``numpy`` 向量化计算。
 
-    return res
+    Args:
+        secs (numpy.ndarray): 一天中经过的秒数组成的一维整数数组，取值范围为 ``[0, 86400)``
+
+    Returns:
+        tuple[numpy.ndarray, numpy.ndarray, numpy.ndarray]: 时、分、秒组成的三个数组
+
+    Examples:
+        >>> import numpy as np
+        >>> h, m, s = secs_to_hms(np.array([0, 36610, 86399]))
+        >>> h.tolist(), m.tolist(), s.tolist()
+        ([0, 10, 23], [0, 10, 59], [0, 10, 59])
+    """
+    np = _require_numpy('secs_to_hms')
+    secs = np.asarray(secs, dtype=np.int64)
+    if secs.size and (secs.min() < 0 or secs.max() >= 86400):
+        raise ValueError(f"Invalid time value for CSES format: {repr_(secs.tolist())}")
+    if (kernels := _numba_kernels()) is not None:
+        hours, minutes, seconds = (np.empty(secs.size, np.uint8) for _ in range(3))
+        kernels[1](secs, hours, minutes, seconds)
+        return hours, minutes, seconds
+    return (secs // 3600).astype(np.uint8), (secs // 60 % 60).astype(np.uint8), (secs % 60).astype(np.uint8)
+
+
+def seconds_of_day(any_time: datetime.time) -> int:
+    """
+    计算 ``datetime.time`` 对象表示的时间是一天中的第多少秒，即 ``ensure_time`` 处理整数时的逆运算。
+
+    Args:
+        any_time (datetime.time): 要转换的时间对象
+
+    Returns:
+        int: 该时间在一天中经过的秒数
+
+    Examples:
+        >>> seconds_of_day(datetime.time(10, 10, 10))
+        36610
+    """
+    return any_time.hour * 3600 + any_time.minute * 60 + any_time.second
+
+
+_TAG_STR = 'tag:yaml.org,2002:str'
 
 
 def serialize_time(dumper: yaml.representer.BaseRepresenter, any_time: datetime.time) -> yaml.nodes.ScalarNode:
@@ -93,8 +336,8 @@ def serialize_time(dumper: yaml.representer.BaseRepresenter, any_time: datetime.
     Returns:
         str: 对应的时间字符串，格式为 ``HH:MM:SS``
     """
-    res = any_time.strftime("%H:%M:%S")
-    return dumper.represent_scalar('tag:yaml.org,2002:str', res)
+    res = f"{any_time.hour:02d}:{any_time.minute:02d}:{any_time.second:02d}"  # 比 strftime 省去格式串解析
+    return dumper.represent_scalar(_TAG_STR, res)
 
 
 class CustomizeDumper(yaml.Dumper):
@@ -107,3 +350,22 @@ class CustomizeDumper(yaml.Dumper):
     def increase_indent(self, flow=False, indentless=False):
         # 确保列表项使用两个空格缩进
         return super().increase_indent(flow, False)
+
+
+CustomizeDumper.add_representer(datetime.time, serialize_time)
+
+
+class SafeDumper(getattr(yaml, 'CSafeDumper', yaml.SafeDumper)):
+    """
+    优先基于 libyaml 的 C 实现（ ``yaml.CSafeDumper`` ）的 Dumper，若不可用则回退到 ``yaml.SafeDumper`` 。
+    与 ``CustomizeDumper`` 一样禁用别名功能，并注册了 ``datetime.time`` 的序列化钩子。
+
+    ``CSES.to_yaml(fast=True)`` 即使用此 Dumper。
+
+    .. note:: libyaml 的输出器不支持 ``CustomizeDumper`` 对列表缩进的调整，因此列表项不会额外缩进。
+    """
+    def ignore_aliases(self, data):
+        return True
+
+
+SafeDumper.add_representer(datetime.time, serialize_time)